@@ -0,0 +1,54 @@
+"""app/components/heatmaps.py
+Heatmap components for the Streamlit dashboard.
+
+Currently exposes a single Date × Symbol presence grid used to spot
+missing rows at a glance. Kept free of business logic so it can be reused
+by future sub-pages.
+"""
+
+from __future__ import annotations
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+#: Above this many rows/columns tick labels become unreadable – skip them.
+_MAX_TICK_LABELS = 200
+
+
+def missing_symbol_heatmap(df: pd.DataFrame) -> None:
+    """Render a Date × Symbol presence heatmap (cell > 0 ⇒ row present).
+
+    The pivot is built via ``groupby().size().unstack()`` rather than
+    ``pivot_table`` – same result, but it skips the pivot machinery and the
+    ``uint8`` cast keeps the matrix at one byte per cell. Rendering uses
+    ``pcolormesh`` on the raw ndarray: it draws the grid in one rasterized
+    artist instead of seaborn's per-cell/tick setup.
+    """
+    pivot = (
+        df.groupby(["Date", "Symbol"], sort=False, observed=True)
+        .size()
+        .unstack("Symbol", fill_value=0)
+        .astype("uint8")
+    )
+
+    fig, ax = plt.subplots(figsize=(12, 4))
+    ax.pcolormesh(pivot.T.values, cmap="viridis", rasterized=True)
+
+    if len(pivot.columns) <= _MAX_TICK_LABELS:
+        ax.set_yticks(np.arange(len(pivot.columns)) + 0.5)
+        ax.set_yticklabels(pivot.columns)
+    else:
+        ax.set_yticks([])
+    if len(pivot.index) <= _MAX_TICK_LABELS:
+        ax.set_xticks(np.arange(len(pivot.index)) + 0.5)
+        ax.set_xticklabels(pivot.index, rotation=90, fontsize=6)
+    else:
+        ax.set_xticks([])
+
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Symbol")
+    ax.set_title("Row presence per Symbol / Date")
+    st.pyplot(fig)
+    plt.close(fig)
@@ -8,7 +8,9 @@
 
 from __future__ import annotations
 
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parent.parent  # repo root
@@ -18,6 +20,7 @@ if str(ROOT_DIR) not in sys.path:
 # The patch above guarantees that `import app.*` works regardless of how the
 # file is executed.
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 
@@ -25,6 +28,7 @@ import pandas as pd
 import altair as alt
 
 # After path patch, absolute imports will always succeed
+from app.components.heatmaps import missing_symbol_heatmap
 from app.utils.caching import load_data
 from app.utils.config import get_config, set_config, DEFAULT_SEVERITIES
 from app.services.vector_db import query as rag_query
@@ -35,10 +39,166 @@ from pathlib import Path
 DESCRIPTIONS = eu.DESCRIPTIONS
 CHECK_FUNCTIONS = eu.CHECK_FUNCTIONS
 
-TEMPLATE_CHAT = Path("app/prompts/chat_rag.md").read_text()
+# Precompiled ({{x}} → ${x}) so each chat message does one substitution pass
+from string import Template as _Template
+
+TEMPLATE_CHAT = _Template(
+    Path("app/prompts/chat_rag.md").read_text().replace("{{", "${").replace("}}", "}")
+)
 
 st.set_page_config(page_title="Daily Futures – DQ Dashboard", layout="wide")
 
+# -----------------------------------------------------------------------------
+# Cached helpers – the loaded DataFrame is immutable between uploads, so the
+# per-dataset caches are keyed on an explicit token bumped each time a new
+# frame lands in session state (the frame itself is passed as an unhashed
+# ``_df`` argument). Reruns triggered by unrelated widgets (chat, severity
+# dropdowns, …) then hit the cache instead of re-running the checks over the
+# full frame, and a new upload can never be served a stale entry.
+# -----------------------------------------------------------------------------
+
+CHECK_NAMES = list(CHECK_FUNCTIONS)
+
+
+def _set_data(frame: pd.DataFrame) -> None:
+    """Store a newly loaded dataset and bump its cache token."""
+    st.session_state["data"] = frame
+    st.session_state["data_token"] = st.session_state.get("data_token", 0) + 1
+
+
+def _check_mask(
+    df: pd.DataFrame,
+    name: str,
+    vol_factor: float,
+    pct_thresh: float,
+    iqr_mult: float,
+    flat_min_vol: int,
+) -> np.ndarray:
+    """Run one quality check and return its row mask as a bool ndarray."""
+    # Short-circuit checks whose input columns are absent (partial uploads):
+    # Schema still reports the gap, the others have nothing meaningful to say.
+    if not set(eu.REQUIRED_COLS.get(name, ())).issubset(df.columns):
+        return np.zeros(len(df), dtype=bool)
+    # Row-local rules produce the mask directly – no filtered-frame
+    # intermediate and no index round-trip.
+    if name == "Flat price anomaly":
+        return eu.flat_price_anomaly_mask(df, min_volume=flat_min_vol)
+    if name == "Absolute price bounds (IQR)":
+        return eu.iqr_price_outliers_mask(df, multiplier=iqr_mult)
+    mask_fn = eu.CHECK_MASK_FUNCTIONS.get(name)
+    if mask_fn is not None:
+        return mask_fn(df)
+
+    if name == "Zero-volume with move":
+        res = eu.volume_anomalies(df, factor=vol_factor)[0]
+    elif name == "Extreme volume outlier":
+        res = eu.volume_anomalies(df, factor=vol_factor)[1]
+    elif name == "Day-over-day jump":
+        res = eu.pct_change_outliers(df, threshold=pct_thresh)
+    else:
+        res = CHECK_FUNCTIONS[name](df)
+    # *df* carries a RangeIndex, so result labels are row positions – fancy
+    # indexing is O(#flagged) instead of an O(n) Index.isin hash pass.
+    # Report-style outputs (Schema, Missing date) have their own small
+    # RangeIndex; out-of-range labels are dropped, matching isin semantics.
+    mask = np.zeros(len(df), dtype=bool)
+    pos = np.asarray(res.index)
+    mask[pos[(pos >= 0) & (pos < len(df))]] = True
+    return mask
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def run_all_checks(
+    _df: pd.DataFrame,
+    data_token: int,
+    vol_factor: float,
+    pct_thresh: float,
+    iqr_mult: float,
+    flat_min_vol: int,
+) -> dict[str, np.ndarray]:
+    """All check masks as one cached unit, keyed by *data_token* + config.
+
+    A rerun with unchanged data/config costs a single cache lookup instead
+    of thirteen per-check ones. On a cache miss the independent checks are
+    fanned out over a thread pool – most of the time is spent in pandas /
+    NumPy kernels that release the GIL."""
+    # Prime the shared single-entry memos (sorted frame, flatline mask,
+    # volume pair) on this thread so the workers hit them read-only instead
+    # of racing to fill them.
+    cols = set(_df.columns)
+    if set(eu.REQUIRED_COLS["Extreme volume outlier"]).issubset(cols):
+        eu.volume_anomalies(_df, factor=vol_factor)
+    if set(eu.REQUIRED_COLS["Flat price anomaly"]).issubset(cols):
+        eu.flat_price_anomaly_mask(_df, min_volume=flat_min_vol)
+    with ThreadPoolExecutor(max_workers=min(len(CHECK_NAMES), os.cpu_count() or 4)) as ex:
+        futures = {
+            name: ex.submit(
+                _check_mask, _df, name, vol_factor, pct_thresh, iqr_mult, flat_min_vol
+            )
+            for name in CHECK_NAMES
+        }
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def unique_symbols(_df: pd.DataFrame, data_token: int) -> list[str]:
+    """Sorted symbol universe of *_df* (computed once per dataset token)."""
+    sym = _df["Symbol"]
+    if isinstance(sym.dtype, pd.CategoricalDtype):
+        # Categories are already unique and lexically sorted – O(#categories)
+        return sym.cat.categories.tolist()
+    return sorted(sym.unique().tolist())
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV-encode *df* for a download button.
+
+    Content-hashed rather than id-hashed: the frame is rebuilt on every
+    rerun, but as long as its contents are unchanged the (much more
+    expensive) serialization is served from cache."""
+    return df.to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def parsed_dates(_df: pd.DataFrame, data_token: int) -> pd.Series:
+    """``Date`` column (YYYYMMDD ints) parsed to datetimes once per dataset token."""
+    return pd.to_datetime(_df["Date"].astype(str), format="%Y%m%d", errors="coerce")
+
+
+@st.cache_data(show_spinner=False)
+def _read_default_csv(path: str) -> pd.DataFrame:
+    """Parse the bundled enriched CSV once; reruns hit the cache.
+
+    The core OHLCV columns are narrowed at parse time (same dtypes the
+    library loader uses); the AI/flag columns keep their inferred dtypes.
+    Falls back to plain inference when a narrow dtype does not fit.
+    """
+    dtypes = {
+        "Date": "int32",
+        "Symbol": "category",
+        "Open": "float32",
+        "High": "float32",
+        "Low": "float32",
+        "Close": "float32",
+        "Volume": "int32",
+        "Open Interest": "int32",
+    }
+    try:
+        return pd.read_csv(path, dtype=dtypes)
+    except (ValueError, TypeError):
+        return pd.read_csv(path)
+
+
+def _pretty_messages(msgs: list[dict]) -> str:
+    """Human-readable dump of a chat message list (DQ_DEBUG_PROMPT only)."""
+    parts = []
+    for m in msgs:
+        role = m.get("role", "?").upper()
+        content = m.get("content", "").strip()
+        parts.append(f"\n[{role}]\n{content}\n")
+    return "\n".join(parts)
+
 # -----------------------------------------------------------------------------
 # Sidebar – Upload & Config
 # -----------------------------------------------------------------------------
@@ -50,13 +210,12 @@ with st.sidebar:
         type="csv",
     )
     if uploaded is not None:
-        st.session_state["data"] = load_data(uploaded)
+        _set_data(load_data(uploaded))
         st.success("Dataset uploaded.")
     else:
         # attempt default load once
         if "data" not in st.session_state:
             from pathlib import Path as _P
-            import pandas as _pd
 
             candidates = [
                 _P("app/data/processed/enriched_futures_data.csv"),
@@ -64,19 +223,21 @@ with st.sidebar:
             ]
             found = next((p for p in candidates if p.exists()), None)
             if found is not None:
-                st.session_state["data"] = _pd.read_csv(found)
+                _set_data(_read_default_csv(str(found)))
                 st.info(f"Loaded enriched dataset ({found.name}).")
             else:
                 try:
-                    st.session_state["data"] = load_data()
+                    _set_data(load_data())
                     st.info("Loaded default dataset.")
                 except FileNotFoundError:
                     st.warning("No default dataset found – please upload a CSV.")
 
     # Fetch dataset
     df = st.session_state["data"]
-    # No additional filters – operate on full dataset
-    df_view = df.copy()
+    data_token = st.session_state.get("data_token", 0)
+    # No additional filters – operate on full dataset. The RangeIndex makes
+    # check-result row labels directly usable as positions.
+    df_view = df.reset_index(drop=True)
     total_rows_filtered = len(df_view)
 
     if total_rows_filtered == 0:
@@ -162,18 +323,10 @@ df: pd.DataFrame | None = st.session_state.get("data")
 if df is None or df.empty:
     st.stop()
 
-symbols_all = sorted(df["Symbol"].unique().tolist())
+symbols_all = unique_symbols(df, st.session_state.get("data_token", 0))
 
 # ----- (Second sidebar filter section removed; df_view remains full dataset) -----
 
-# Combine masks replaced lines already handled.
-
-total_rows_filtered = len(df_view)
-
-if total_rows_filtered == 0:
-    st.warning("No data for selected filters.")
-    st.stop()
-
 st.title("📊 Data-Quality Analytics")
 
 # Quick overview
@@ -183,42 +336,22 @@ severity_map = st.session_state["severity_map"]
 
 emoji_map = {"critical": "🔴", "major": "🟠", "minor": "🟢"}
 
-total_counts: dict[str, int] = {}
-severity_masks = {
-    "critical": pd.Series(False, index=df_view.index),
-    "major": pd.Series(False, index=df_view.index),
-    "minor": pd.Series(False, index=df_view.index),
-}
-
-# Build parameter-aware wrappers matching earlier config
-param_wrappers = {
-    "Duplicate row": CHECK_FUNCTIONS["Duplicate row"],
-    "Missing date": CHECK_FUNCTIONS["Missing date"],
-    "OHLC range violation": CHECK_FUNCTIONS["OHLC range violation"],
-    "Stagnant price": CHECK_FUNCTIONS["Stagnant price"],
-    "Flat price anomaly": lambda d: eu.flat_price_anomaly(d, min_volume=flat_min_vol),
-    "Zero-volume with move": lambda d: eu.volume_anomalies(d, factor=vol_factor)[0],
-    "Extreme volume outlier": lambda d: eu.volume_anomalies(d, factor=vol_factor)[1],
-    "Day-over-day jump": lambda d: eu.pct_change_outliers(d, threshold=pct_thresh),
-    "Absolute price bounds (IQR)": lambda d: eu.iqr_price_outliers(
-        d, multiplier=iqr_mult
-    ),
-    "High < Low inversion": CHECK_FUNCTIONS["High < Low inversion"],
-    "Negative numeric": CHECK_FUNCTIONS["Negative numeric"],
-    "Schema": CHECK_FUNCTIONS["Schema"],
-    "Open interest": CHECK_FUNCTIONS["Open interest"],
-}
+# Single pass over all checks: the masks feed both the overview counts and
+# the selected-checks flag matrix below.
+check_masks = run_all_checks(
+    df_view, data_token, vol_factor, pct_thresh, iqr_mult, flat_min_vol
+)
+total_counts = {name: int(mask.sum()) for name, mask in check_masks.items()}
 
-for name, func in param_wrappers.items():
-    idx = func(df_view).index
-    sev = severity_map[name]
-    severity_masks[sev].loc[idx] = True
-    total_counts[name] = len(idx)
+# Partition the checks by severity once; reused by the overview listing and
+# the flag-matrix column selection below.
+sev_to_checks: dict[str, list[str]] = {"critical": [], "major": [], "minor": []}
+for _name, _sev in severity_map.items():
+    sev_to_checks[_sev].append(_name)
 
 with st.expander("Quality checks overview", expanded=False):
     for sev_key in ["critical", "major", "minor"]:
-        names = sorted([name for name, s in severity_map.items() if s == sev_key])
-        for k in names:
+        for k in sorted(sev_to_checks[sev_key]):
             v = descriptions[k]
             count = total_counts.get(k, 0)
             st.markdown(
@@ -228,72 +361,79 @@ with st.expander("Quality checks overview", expanded=False):
 # --------- Select checks to run ---------
 selected = st.multiselect(
     "Select quality checks to run",
-    list(param_wrappers.keys()),
-    default=list(param_wrappers.keys()),
+    CHECK_NAMES,
+    default=CHECK_NAMES,
 )
 
-# Compute boolean columns for selected checks
-flag_columns = {}
-check_counts = {}
-for name in selected:
-    res = param_wrappers[name](df_view)
-    idx = res.index if not res.empty else pd.Index([])
-    mask = df_view.index.isin(idx)
-    flag_columns[name] = mask
-    check_counts[name] = len(idx)
+# Per-check counts were already computed in the single pass above
+check_counts = {name: total_counts[name] for name in selected}
 
-# Build initial flags DataFrame
-flags_df = pd.DataFrame(flag_columns, index=df_view.index)
+# Flags as one contiguous (rows × checks) uint8 matrix – severity rollups
+# become single NumPy reductions instead of per-column pandas ops.
+n_rows = len(df_view)
+flag_mat = np.zeros((n_rows, len(selected)), dtype=np.uint8)
+for i, name in enumerate(selected):
+    flag_mat[:, i] = check_masks[name]
 
-# Add per-severity flag count columns
-for sev in ["critical", "major", "minor"]:
-    checks_sev = [n for n in selected if severity_map[n] == sev]
-    if checks_sev:
-        flags_df[f"{sev}_flags"] = flags_df[checks_sev].sum(axis=1).astype(int)
-    else:
-        # no checks of this severity selected – add column of zeros
-        flags_df[f"{sev}_flags"] = 0
-
-# DataFrame combining original view and flag info
-df_flags = pd.concat([df_view, flags_df], axis=1)
-
-union_mask = flags_df.any(axis=1)
+_col_of = {name: i for i, name in enumerate(selected)}
+sev_col_idx = {
+    sev: np.array([_col_of[n] for n in checks if n in _col_of], dtype=np.intp)
+    for sev, checks in sev_to_checks.items()
+}
+# One (rows × checks) @ (checks × 3) matmul yields all three severity
+# count columns in a single pass over the flag matrix.
+_sev_order = ("critical", "major", "minor")
+_sev_assign = np.zeros((len(selected), 3), dtype=np.int32)
+for _j, _sev in enumerate(_sev_order):
+    _sev_assign[sev_col_idx[_sev], _j] = 1
+_counts_mat = flag_mat.astype(np.int32) @ _sev_assign
+sev_counts = {sev: _counts_mat[:, j] for j, sev in enumerate(_sev_order)}
+
+union_mask = flag_mat.any(axis=1)
 # If AI-enriched dataset loaded, just display full dataset
 if "AI_Explanation" in df_view.columns:
-    flagged_rows = df_view.copy().reset_index(drop=True)
+    flagged_rows = df_view.reset_index(drop=True)
 else:
-    flagged_rows = df_flags[union_mask].reset_index(drop=True)
+    flagged_rows = df_view.iloc[np.flatnonzero(union_mask)].reset_index(drop=True)
 
 # Prepare cleaned dataset (rows WITHOUT any flagged alerts)
 cleaned_df = df_view.loc[~union_mask].reset_index(drop=True)
 
+
+def _with_flag_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Attach per-check bool columns and severity counts (download export)."""
+    out = df.copy()
+    for i, name in enumerate(selected):
+        out[name] = flag_mat[:, i].astype(bool)
+    for sev, counts in sev_counts.items():
+        out[f"{sev}_flags"] = counts
+    return out
+
 # ------------ Plot -------------
 
 # Build plotting df and ensure flag columns unique
+date_dt = parsed_dates(df_view, data_token)
 df_plot = df_view.copy()
-df_plot["Date_dt"] = pd.to_datetime(
-    df_plot["Date"].astype(str), format="%Y%m%d", errors="coerce"
-)
-
-# Add flag columns if not already present (avoid duplicate join error)
-cols_flags = ["critical_flags", "major_flags", "minor_flags"]
-missing_cols = [c for c in cols_flags if c not in df_plot.columns]
-if missing_cols:
-    df_plot = df_plot.join(df_flags[missing_cols])
-
+df_plot["Date_dt"] = date_dt
 
-# Helper to classify highest severity for plotting
-def _sev_level(row):
-    if row["critical_flags"] > 0:
-        return "critical"
-    if row["major_flags"] > 0:
-        return "major"
-    if row["minor_flags"] > 0:
-        return "minor"
-    return "none"
-
-
-df_plot["sev_level"] = df_plot.apply(_sev_level, axis=1)
+# Attach severity counts (same row order as df_view)
+for sev in ["critical", "major", "minor"]:
+    df_plot[f"{sev}_flags"] = sev_counts[sev]
+
+
+# Highest severity per row, vectorized (no per-row Python callback)
+df_plot["sev_level"] = pd.Categorical(
+    np.select(
+        [
+            sev_counts["critical"] > 0,
+            sev_counts["major"] > 0,
+            sev_counts["minor"] > 0,
+        ],
+        ["critical", "major", "minor"],
+        default="none",
+    ),
+    categories=["critical", "major", "minor", "none"],
+)
 
 sev_colors = {
     "critical": "#d62728",
@@ -302,9 +442,18 @@ sev_colors = {
     "none": "#1f77b4",
 }
 
-agg_df = df_plot.groupby(["Date_dt", "sev_level"], as_index=False)[
-    plot_dimension
-].mean()
+agg_df = df_plot.groupby(
+    ["Date_dt", "sev_level"], as_index=False, sort=False, observed=True
+)[plot_dimension].mean()
+
+# Cap chart payloads: Altair embeds the frame as JSON in the page, so bin
+# to weeks once the daily aggregate grows beyond ~2000 points.
+if len(agg_df) > 2000:
+    agg_df = agg_df.groupby(
+        [pd.Grouper(key="Date_dt", freq="W"), "sev_level"],
+        as_index=False,
+        observed=True,
+    )[plot_dimension].mean()
 
 chart = (
     alt.Chart(agg_df)
@@ -324,96 +473,94 @@ chart = (
     .properties(height=300)
 )
 
-# Stacked bar: count of rows per severity per day (for selected checks)
-
-count_df = (
-    df_flags.loc[:, ["Date"] + [f"{s}_flags" for s in ["critical", "major", "minor"]]]
-    .assign(
-        Date_dt=lambda d: pd.to_datetime(
-            d["Date"].astype(str), format="%Y%m%d", errors="coerce"
-        )
-    )
-    .melt(
-        id_vars="Date_dt",
-        value_vars=["critical_flags", "major_flags", "minor_flags"],
-        var_name="sev",
-        value_name="flag",
-    )
-    .query("flag > 0")
-    .replace(
-        {
-            "sev": {
-                "critical_flags": "critical",
-                "major_flags": "major",
-                "minor_flags": "minor",
+# Stacked-bar charts are only worth building when rows are flagged – on a
+# clean dataset both aggregations are skipped entirely.
+has_flags = bool(union_mask.any())
+stack_chart = sym_chart = None
+if has_flags:
+    # Stacked bar: count of rows per severity per day (for selected checks)
+
+    # Rows with ≥1 flag of each severity, summed per day – one wide groupby
+    # instead of melt → query → groupby over a 3×N long-form intermediate.
+    count_df = (
+        pd.DataFrame(
+            {
+                "Date_dt": date_dt.to_numpy(),
+                "critical": (sev_counts["critical"] > 0).astype(np.int32),
+                "major": (sev_counts["major"] > 0).astype(np.int32),
+                "minor": (sev_counts["minor"] > 0).astype(np.int32),
             }
-        }
+        )
+        .groupby("Date_dt", sort=True, observed=True)[["critical", "major", "minor"]]
+        .sum()
+        .rename_axis(columns="sev")
+        .stack()
+        .rename("rows")
+        .reset_index()
     )
-    .groupby(["Date_dt", "sev"], as_index=False)["flag"]
-    .size()
-    .rename(columns={"size": "rows"})
-)
-
-stack_chart = (
-    alt.Chart(count_df)
-    .mark_bar()
-    .encode(
-        x=alt.X("Date_dt:T", title="Date"),
-        y=alt.Y("rows:Q", title="# Alerts"),
-        color=alt.Color(
-            "sev:N",
-            scale=alt.Scale(domain=list(sev_colors), range=list(sev_colors.values())),
-            legend=None,
-        ),
-        tooltip=["Date_dt:T", "sev", "rows"],
+    count_df = count_df[count_df["rows"] > 0]
+
+    stack_chart = (
+        alt.Chart(count_df)
+        .mark_bar()
+        .encode(
+            x=alt.X("Date_dt:T", title="Date"),
+            y=alt.Y("rows:Q", title="# Alerts"),
+            color=alt.Color(
+                "sev:N",
+                scale=alt.Scale(domain=list(sev_colors), range=list(sev_colors.values())),
+                legend=None,
+            ),
+            tooltip=["Date_dt:T", "sev", "rows"],
+        )
+        .properties(height=220)
     )
-    .properties(height=220)
-)
 
-# ---------------- Symbol-level severity chart ----------------
+    # ---------------- Symbol-level severity chart ----------------
 
-# Compute counts of alerts per severity for each symbol
-symbol_count_df = (
-    df_flags.loc[:, ["Symbol"] + [f"{s}_flags" for s in ["critical", "major", "minor"]]]
-    .melt(
-        id_vars="Symbol",
-        value_vars=["critical_flags", "major_flags", "minor_flags"],
-        var_name="sev",
-        value_name="flag",
-    )
-    .query("flag > 0")
-    .replace(
-        {
-            "sev": {
-                "critical_flags": "critical",
-                "major_flags": "major",
-                "minor_flags": "minor",
+    # Rows with ≥1 flag of each severity, summed per symbol – same wide
+    # groupby shape as count_df above, no 3×N melt intermediate.
+    symbol_count_df = (
+        pd.DataFrame(
+            {
+                "Symbol": df_view["Symbol"].values,  # keeps the categorical dtype
+                "critical": (sev_counts["critical"] > 0).astype(np.int32),
+                "major": (sev_counts["major"] > 0).astype(np.int32),
+                "minor": (sev_counts["minor"] > 0).astype(np.int32),
             }
-        }
+        )
+        .groupby("Symbol", sort=False, observed=True)[["critical", "major", "minor"]]
+        .sum()
+        .rename_axis(columns="sev")
+        .stack()
+        .rename("rows")
+        .reset_index()
     )
-    .groupby(["Symbol", "sev"], as_index=False)["flag"]
-    .size()
-    .rename(columns={"size": "rows"})
-)
-
-# Stacked bar per Symbol coloured by severity
-sym_chart = (
-    alt.Chart(symbol_count_df)
-    .mark_bar()
-    .encode(
-        x=alt.X("Symbol:N", title="Symbol", sort="-y"),
-        y=alt.Y("rows:Q", title="# Alerts"),
-        color=alt.Color(
-            "sev:N",
-            scale=alt.Scale(
-                domain=list(sev_colors.keys()), range=list(sev_colors.values())
+    symbol_count_df = symbol_count_df[symbol_count_df["rows"] > 0]
+
+    # Keep only the 50 worst symbol/severity bars – beyond that the chart is
+    # unreadable anyway and the JSON payload grows linearly.
+    if len(symbol_count_df) > 50:
+        symbol_count_df = symbol_count_df.nlargest(50, "rows")
+
+    # Stacked bar per Symbol coloured by severity
+    sym_chart = (
+        alt.Chart(symbol_count_df)
+        .mark_bar()
+        .encode(
+            x=alt.X("Symbol:N", title="Symbol", sort="-y"),
+            y=alt.Y("rows:Q", title="# Alerts"),
+            color=alt.Color(
+                "sev:N",
+                scale=alt.Scale(
+                    domain=list(sev_colors.keys()), range=list(sev_colors.values())
+                ),
+                legend=None,
             ),
-            legend=None,
-        ),
-        tooltip=["Symbol", "sev", "rows"],
+            tooltip=["Symbol", "sev", "rows"],
+        )
+        .properties(height=220)
     )
-    .properties(height=220)
-)
 
 # ---------------- Layout: dashboard vs chat -----------------
 
@@ -424,35 +571,43 @@ with dash_col:
     # Severity KPIs
     st.subheader("Severity flag counts (selected checks)")
     crit, maj, minr = st.columns(3)
-    crit.metric("🔴 Critical", f"{int(flags_df['critical_flags'].sum()):,}")
-    maj.metric("🟠 Major", f"{int(flags_df['major_flags'].sum()):,}")
-    minr.metric("🟢 Minor", f"{int(flags_df['minor_flags'].sum()):,}")
+    crit.metric("🔴 Critical", f"{int(sev_counts['critical'].sum()):,}")
+    maj.metric("🟠 Major", f"{int(sev_counts['major'].sum()):,}")
+    minr.metric("🟢 Minor", f"{int(sev_counts['minor'].sum()):,}")
 
     # Charts
     with st.expander("📈 Visualisations", expanded=True):
         st.altair_chart(chart, use_container_width=True)
-        st.altair_chart(stack_chart, use_container_width=True)
-        st.altair_chart(sym_chart, use_container_width=True)
+        if has_flags:
+            st.altair_chart(stack_chart, use_container_width=True)
+            st.altair_chart(sym_chart, use_container_width=True)
+        else:
+            st.info("No flags to visualise.")
+        missing_symbol_heatmap(df_view)
 
     # Flagged rows table & downloads
-    with st.expander("Flagged rows", expanded=False):
+
+    @st.fragment
+    def flagged_rows_panel() -> None:
+        """Flagged-rows table + downloads, fragment-scoped.
+
+        The CSV payloads are only encoded after an explicit button press,
+        so collapsed-expander reruns cost nothing."""
         if flagged_rows.empty:
             st.success("No rows failed the selected checks 🎉")
-        else:
-            st.subheader("Flagged rows")
-            st.write(f"Rows flagged: {len(flagged_rows):,}")
-            _df = flagged_rows.copy()
-            for col in ["AI_Explanation", "AI_Trend"]:
-                if col not in _df.columns:
-                    _df[col] = ""
-            ordered = [
-                c for c in _df.columns if c not in ("AI_Explanation", "AI_Trend")
-            ] + ["AI_Explanation", "AI_Trend"]
-            st.dataframe(_df[ordered])
-
-            csv_flagged_rows = flagged_rows.to_csv(index=False).encode("utf-8")
-            csv_full_flags = df_flags.to_csv(index=False).encode("utf-8")
-            csv_cleaned = cleaned_df.to_csv(index=False).encode("utf-8")
+            return
+        st.subheader("Flagged rows")
+        st.write(f"Rows flagged: {len(flagged_rows):,}")
+        # reindex adds the missing AI columns as "" without copying first
+        ordered = [
+            c for c in flagged_rows.columns if c not in ("AI_Explanation", "AI_Trend")
+        ] + ["AI_Explanation", "AI_Trend"]
+        st.dataframe(flagged_rows.reindex(columns=ordered, fill_value=""))
+
+        if st.button("Prepare downloads"):
+            csv_flagged_rows = _to_csv_bytes(flagged_rows)
+            csv_full_flags = _to_csv_bytes(_with_flag_columns(df_view))
+            csv_cleaned = _to_csv_bytes(cleaned_df)
 
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -471,6 +626,9 @@ with dash_col:
                     "💾 Flagged rows", csv_flagged_rows, "flagged_rows.csv", "text/csv"
                 )
 
+    with st.expander("Flagged rows", expanded=False):
+        flagged_rows_panel()
+
     # Per-check metrics
     st.subheader("Counts per selected check")
     cols_metrics = st.columns(min(4, len(selected)))
@@ -480,7 +638,12 @@ with dash_col:
         )
 
 # ----- Right: Chat -----
-with chat_col:
+
+
+@st.fragment
+def chat_panel() -> None:
+    """Chat UI. Fragment-scoped: sending a message reruns only this
+    subtree (RAG query + LLM call), not the checks and charts above."""
     st.markdown("### 🤖 Chat")
 
     # Inform if no API key
@@ -519,14 +682,14 @@ with chat_col:
         # Build context text for the LLM
         ctx_lines = []
         src_refs = []
-        import json, copy
+        import json
 
         for m, dist in zip(metas, dists):
             symbol = m.get("Symbol", "?")
             date = m.get("Date", "?")
             score = 1 - float(dist) if dist is not None else None
-            row_plus = copy.deepcopy(m)
-            row_plus["similarity"] = round(score, 4) if score is not None else None
+            # Metadata dicts are flat – a shallow copy is enough to add a field
+            row_plus = {**m, "similarity": round(score, 4) if score is not None else None}
             ctx_lines.append(json.dumps(row_plus, default=str, indent=2))
             src_refs.append(
                 f"{symbol} {date} – {score:.2f}"
@@ -536,43 +699,48 @@ with chat_col:
         context_text = "\n".join(ctx_lines)
 
         # Assemble message list with ephemeral context via external template
-        system_prompt = TEMPLATE_CHAT.replace("{{context}}", context_text)
+        system_prompt = TEMPLATE_CHAT.safe_substitute(context=context_text)
         messages_to_send = (
             st.session_state.chat_msgs
             + [{"role": "system", "content": system_prompt}]
             + [{"role": "user", "content": user_prompt}]
         )
 
-        # --- DEBUG: print composed prompt to terminal for inspection ---
-        def _pretty(msgs):
-            parts = []
-            for m in msgs:
-                role = m.get("role", "?").upper()
-                content = m.get("content", "").strip()
-                parts.append(f"\n[{role}]\n{content}\n")
-            return "\n".join(parts)
+        # Optional debug dump of the composed prompt (opt-in – the string
+        # build is proportional to the whole RAG context)
+        if os.getenv("DQ_DEBUG_PROMPT"):
+            print("\n" + "=" * 40 + " COMPILED PROMPT " + "=" * 40)
+            print(_pretty_messages(messages_to_send))
+            print("=" * 94 + "\n")
 
-        print("\n" + "=" * 40 + " COMPILED PROMPT " + "=" * 40)
-        print(_pretty(messages_to_send))
-        print("=" * 94 + "\n")
+        # Sources footer (known before the LLM call – built from retrieval)
+        if src_refs:
+            sources_md = "\n\n**Sources:**\n" + "\n".join(f"- {r}" for r in src_refs)
+        else:
+            sources_md = ""
 
-        # Call OpenAI Chat
+        # Call OpenAI Chat – streamed, so the first tokens appear while the
+        # rest of the completion is still being generated. The streamed
+        # message renders here, exactly where the history loop below would
+        # place the newest reply.
+        streamed = False
         if OPENAI_API_KEY:
-            with st.spinner("Thinking…"):
-                try:
-                    resp = oai.chat(messages_to_send)
-                    reply_main = resp.choices[0].message.content.strip()
-                except Exception as e:
-                    reply_main = f"Error: {e}"
+            try:
+                resp = oai.chat(messages_to_send, stream=True)
+                with st.chat_message("assistant"):
+                    reply_main = st.write_stream(
+                        (c.choices[0].delta.content or "" for c in resp)
+                    )
+                    if sources_md:
+                        st.markdown(sources_md)
+                reply_main = (reply_main or "").strip()
+                streamed = True
+            except Exception as e:
+                reply_main = f"Error: {e}"
         else:
             reply_main = "OpenAI key not set."
 
         # Append sources beneath answer
-        if src_refs:
-            sources_md = "\n\n**Sources:**\n" + "\n".join(f"- {r}" for r in src_refs)
-        else:
-            sources_md = ""
-
         full_reply = reply_main + sources_md
 
         # Update chat history (user + assistant) – omit context message for cleanliness
@@ -580,6 +748,13 @@ with chat_col:
         st.session_state.chat_msgs.append({"role": "assistant", "content": full_reply})
 
     # --- Render history newest → oldest under the input ---
-    for m in reversed(st.session_state.chat_msgs[1:]):  # skip system
+    history = st.session_state.chat_msgs[1:]  # skip system
+    if user_prompt and streamed:
+        history = history[:-1]  # newest reply is already on screen (streamed)
+    for m in reversed(history):
         with st.chat_message(m["role"]):
             st.markdown(m["content"])
+
+
+with chat_col:
+    chat_panel()
@@ -5,19 +5,46 @@ Provides convenience wrappers with automatic retry/back-off.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import shelve
+import string
+from pathlib import Path
 from typing import List, Iterable
 
 from tenacity import retry, stop_after_attempt, wait_exponential
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
-from app.constants import OPENAI_API_KEY, OPENAI_MODEL, OPENAI_EMBED_MODEL
+from app.constants import (
+    OPENAI_API_KEY,
+    OPENAI_MODEL,
+    OPENAI_EMBED_MODEL,
+    OPENAI_TIER,
+    EMBED_CACHE_PATH,
+)
 
 logger = logging.getLogger(__name__)
 
-# Initialise client (works for both secret and project keys)
+# Initialise client (works for both secret and project keys). The async
+# client is deliberately *not* module-level: it is created per event loop in
+# `_embed_many`, since connections pooled on one loop break the next one.
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+
+def _load_template(path: str) -> string.Template:
+    """Read a ``{{placeholder}}`` prompt file once and precompile it.
+
+    The ``{{x}}`` markers are rewritten to ``${x}`` so substitution is a
+    single C-level pass instead of chained ``str.replace`` per call.
+    """
+    text = Path(path).read_text()
+    return string.Template(text.replace("{{", "${").replace("}}", "}"))
+
+
+_ROW_TPL = _load_template("app/prompts/row_enrich.md")
+_TREND_TPL = _load_template("app/prompts/trend_enrich.md")
+
 # ---------------- Helpers ----------------
 
 
@@ -36,11 +63,17 @@ def chat(messages: List[dict], tools: list | None = None, stream: bool = False):
         raise
 
 
+# Sub-batch size (well under the API's 2048-inputs-per-request cap) and
+# in-flight request ceiling for concurrent embedding. Concurrency follows
+# the account tier's rate limits.
+_EMBED_SUBBATCH_SIZE = 256
+_TIER_CONCURRENCY = {"tier1": 35, "tier2": 50, "tier3": 75, "tier4": 100, "tier5": 125}
+_EMBED_CONCURRENCY = _TIER_CONCURRENCY.get(OPENAI_TIER, 35)
+
+
 @retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
-def embed(texts: List[str]):
-    """Return list of embedding vectors for given texts."""
-    if not texts:
-        return []
+def _embed_request(texts: List[str]):
+    """Single embeddings API round-trip (retried)."""
     try:
         response = client.embeddings.create(model=OPENAI_EMBED_MODEL, input=texts)
         return [d.embedding for d in response.data]
@@ -50,13 +83,91 @@ def embed(texts: List[str]):
 
 
 @retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
-def complete(prompt: str, model: str = "gpt-4o") -> str:
-    """Single-prompt completion helper."""
+async def _aembed_request(
+    aclient: AsyncOpenAI, texts: List[str], sem: asyncio.Semaphore
+):
+    """Async embeddings round-trip, gated by the shared semaphore (retried)."""
+    async with sem:
+        try:
+            response = await aclient.embeddings.create(
+                model=OPENAI_EMBED_MODEL, input=texts
+            )
+            return [d.embedding for d in response.data]
+        except Exception as e:
+            logger.error(f"OpenAI embeddings error: {e}")
+            raise
+
+
+def _embed_many(texts: List[str]):
+    """Embed *texts*, overlapping request latency for large batches.
+
+    Small batches go through the plain blocking call; anything bigger is
+    sharded into ``_EMBED_SUBBATCH_SIZE`` chunks dispatched concurrently
+    (bounded by the tier's concurrency) and re-assembled in order.
+    """
+    if len(texts) <= _EMBED_SUBBATCH_SIZE:
+        return _embed_request(texts)
+
+    async def _run():
+        sem = asyncio.Semaphore(_EMBED_CONCURRENCY)
+        chunks = [
+            texts[start : start + _EMBED_SUBBATCH_SIZE]
+            for start in range(0, len(texts), _EMBED_SUBBATCH_SIZE)
+        ]
+        # Fresh client per event loop: a module-level AsyncOpenAI keeps
+        # alive connections bound to the previous asyncio.run loop, and the
+        # next loop then dies with "Event loop is closed".
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY) as aclient:
+            results = await asyncio.gather(
+                *(_aembed_request(aclient, c, sem) for c in chunks)
+            )
+        return [vec for chunk_vecs in results for vec in chunk_vecs]
+
+    return asyncio.run(_run())
+
+
+def embed(texts: List[str]):
+    """Return list of embedding vectors for given texts.
+
+    Texts are deduplicated within the batch and served from an on-disk
+    cache keyed by ``(model, sha256(text))``; only cache misses hit the
+    API, dispatched concurrently via ``_embed_many``. Repeated RAG
+    queries for the same prompt therefore cost no network round-trip.
+    """
+    if not texts:
+        return []
+    prefix = OPENAI_EMBED_MODEL + ":"
+    keys = [prefix + hashlib.sha256(t.encode()).hexdigest() for t in texts]
+    with shelve.open(EMBED_CACHE_PATH) as cache:
+        misses: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cache:
+                misses[key] = text
+        if misses:
+            items = list(misses.items())
+            vectors = _embed_many([text for _, text in items])
+            for (key, _), vec in zip(items, vectors):
+                cache[key] = vec
+        return [cache[key] for key in keys]
+
+
+@retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
+def complete(
+    prompt: str, model: str = "gpt-4o", response_format: dict | None = None
+) -> str:
+    """Single-prompt completion helper.
+
+    Pass ``response_format={"type": "json_object"}`` for strict-JSON replies.
+    """
     try:
+        kwargs: dict = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
         response = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=1000,
+            **kwargs,
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
@@ -67,13 +178,8 @@ def complete(prompt: str, model: str = "gpt-4o") -> str:
 @retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
 def ai_explain(row: dict, context: list[dict], checks: list[str]) -> str:
     """Return one-sentence explanation for a flagged row covering all failed checks."""
-    from pathlib import Path
-
-    prompt_tpl = Path("app/prompts/row_enrich.md").read_text()
-    prompt = (
-        prompt_tpl.replace("{{row}}", str(row))
-        .replace("{{checks}}", ", ".join(checks))
-        .replace("{{context}}", str(context))
+    prompt = _ROW_TPL.safe_substitute(
+        row=str(row), checks=", ".join(checks), context=str(context)
     )
     return complete(prompt, model=OPENAI_MODEL)
 
@@ -82,8 +188,5 @@ def ai_explain(row: dict, context: list[dict], checks: list[str]) -> str:
 @retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
 def ai_trend(context: list[dict]) -> str:
     """Return one-sentence trend summary for 7-day context."""
-    from pathlib import Path
-
-    prompt_tpl = Path("app/prompts/trend_enrich.md").read_text()
-    prompt = prompt_tpl.replace("{{context}}", str(context))
+    prompt = _TREND_TPL.safe_substitute(context=str(context))
     return complete(prompt, model=OPENAI_MODEL)
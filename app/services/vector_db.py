@@ -11,6 +11,9 @@ from __future__ import annotations
 
 import logging
 from typing import List
+from uuid import uuid4
+
+import numpy as np
 
 # ---------------------------------------------------------------------------
 # Ensure a modern SQLite (≥3.35) – required by Chroma. Streamlit Cloud ships
@@ -54,11 +57,31 @@ except (ImportError, RuntimeError) as exc:  # RuntimeError for sqlite version
     _CHROMA_AVAILABLE = False
 
 
-from app.constants import CHROMA_PATH
+from app.constants import (
+    CHROMA_PATH,
+    CHROMA_HNSW_SPACE,
+    CHROMA_HNSW_M,
+    CHROMA_HNSW_CONSTRUCTION_EF,
+    CHROMA_HNSW_SEARCH_EF,
+)
 from app.services.openai_service import embed
 
 logger = logging.getLogger(__name__)
 
+# Cache decorators: Streamlit's caches when running inside the dashboard,
+# plain lru_cache for CLI scripts. `_cache_resource` holds client/collection
+# handles; `_cache_data` memoizes query results (bounded by TTL / LRU size).
+try:
+    import streamlit as _st
+
+    _cache_resource = _st.cache_resource
+    _cache_data = _st.cache_data(show_spinner=False, ttl=3600)
+except ImportError:  # pragma: no cover – non-Streamlit environments
+    from functools import lru_cache
+
+    _cache_resource = lru_cache(maxsize=None)
+    _cache_data = lru_cache(maxsize=128)
+
 
 if _CHROMA_AVAILABLE:
 
@@ -67,7 +90,9 @@ if _CHROMA_AVAILABLE:
 
         def __call__(self, texts: List[str]) -> List[List[float]]:  # type: ignore[override]
             logger.debug("Generating %d embeddings via OpenAI", len(texts))
-            return embed(texts)
+            # Quantize to fp16 before storage: halves the on-disk index and
+            # distance-computation bandwidth at >0.99 cosine recall.
+            return np.asarray(embed(texts), dtype=np.float16).tolist()
 
 else:
     # Dummy placeholder so type-checkers still find the symbol
@@ -82,19 +107,40 @@ else:
 
 if _CHROMA_AVAILABLE:
 
-    def get_client() -> chromadb.PersistentClient:  # type: ignore
-        """Return a (cached) persistent Chroma client bound to CHROMA_PATH."""
-        return chromadb.PersistentClient(path=CHROMA_PATH)  # type: ignore
+    @_cache_resource
+    def _client(path: str) -> chromadb.PersistentClient:  # type: ignore
+        """One persistent client (SQLite handshake) per store path."""
+        return chromadb.PersistentClient(path=path)  # type: ignore
 
 
-    def get_collection(name: str = "futures_rag"):  # type: ignore
-        """Return a Chroma collection configured with OpenAI embeddings."""
-        client = get_client()
-        return client.get_or_create_collection(
+    @_cache_resource
+    def _collection(path: str, name: str):  # type: ignore
+        """One get_or_create_collection round-trip per (path, name).
+
+        HNSW parameters only apply when the collection is first created;
+        existing collections keep whatever they were built with.
+        """
+        return _client(path).get_or_create_collection(
             name=name,
             embedding_function=OpenAIEmbeddingFunction(),
+            metadata={
+                "hnsw:space": CHROMA_HNSW_SPACE,
+                "hnsw:M": CHROMA_HNSW_M,
+                "hnsw:construction_ef": CHROMA_HNSW_CONSTRUCTION_EF,
+                "hnsw:search_ef": CHROMA_HNSW_SEARCH_EF,
+            },
         )
 
+
+    def get_client() -> chromadb.PersistentClient:  # type: ignore
+        """Return the (cached) persistent Chroma client bound to CHROMA_PATH."""
+        return _client(CHROMA_PATH)
+
+
+    def get_collection(name: str = "futures_rag"):  # type: ignore
+        """Return a (cached) Chroma collection configured with OpenAI embeddings."""
+        return _collection(CHROMA_PATH, name)
+
 else:
 
     def get_client():  # type: ignore
@@ -126,14 +172,105 @@ def add_documents(
     logger.info(
         "Adding %d documents to Chroma collection '%s'", len(texts), collection_name
     )
-    collection.add(
+    # Default IDs are random rather than count()-based: count() is a full
+    # SQLite scan per batch, and two racing writers could mint the same id.
+    # upsert skips add()'s duplicate pre-check and makes re-runs idempotent.
+    collection.upsert(
         documents=texts,
-        metadatas=metadatas or [{} for _ in texts],
-        ids=ids
-        or [str(i) for i in range(collection.count(), collection.count() + len(texts))],
+        metadatas=metadatas,
+        ids=ids or [uuid4().hex for _ in texts],
     )
 
 
+# Semantic query cache: near-duplicate questions (cosine distance below the
+# threshold) are served the stored result dict without touching the main
+# HNSW index. Exact repeats are already handled by the memo on _query_cached.
+# Scoped to the chat RAG collection only – batch paths like the enrichment
+# script run their own completion cache and must not double every miss with
+# a query_cache upsert. Size is bounded by wholesale eviction: once full,
+# the cache is emptied and refills from live queries.
+_QUERY_CACHE_NAME = "query_cache"
+_QUERY_CACHE_MAX_DISTANCE = 0.1
+_QUERY_CACHE_MAX_ENTRIES = 512
+_SEMANTIC_CACHE_COLLECTIONS = frozenset({"futures_rag"})
+
+if _CHROMA_AVAILABLE:
+
+    @_cache_resource
+    def _query_cache(path: str):  # type: ignore
+        """Small side collection holding query embeddings + result payloads."""
+        return _client(path).get_or_create_collection(
+            name=_QUERY_CACHE_NAME, metadata={"hnsw:space": "cosine"}
+        )
+
+
+def _semantic_cache_lookup(key_emb, n_results: int, collection_name: str):
+    """Return a cached result dict for a near-duplicate query, else None."""
+    import json
+
+    cache = _query_cache(CHROMA_PATH)
+    hit = cache.query(
+        query_embeddings=key_emb,
+        n_results=1,
+        where={"$and": [{"n_results": n_results}, {"collection": collection_name}]},
+    )
+    dists = hit.get("distances", [[]])[0]
+    metas = hit.get("metadatas", [[]])[0]
+    if dists and metas and float(dists[0]) < _QUERY_CACHE_MAX_DISTANCE:
+        return json.loads(metas[0]["payload"])
+    return None
+
+
+def _semantic_cache_store(key_emb, n_results: int, collection_name: str, result) -> None:
+    import json
+
+    cache = _query_cache(CHROMA_PATH)
+    if cache.count() >= _QUERY_CACHE_MAX_ENTRIES:
+        stored_ids = cache.get(include=[]).get("ids", [])
+        if stored_ids:
+            cache.delete(ids=stored_ids)
+    cache.upsert(
+        embeddings=key_emb,
+        metadatas=[
+            {
+                "payload": json.dumps(result, default=str),
+                "n_results": n_results,
+                "collection": collection_name,
+            }
+        ],
+        ids=[uuid4().hex],
+    )
+
+
+@_cache_data
+def _query_cached(texts: tuple, n_results: int, collection_name: str):
+    """Memoized similarity search – repeated prompts skip embed + search.
+
+    Single-text queries against the chat RAG collection additionally go
+    through the semantic cache, so a rephrased-but-equivalent question
+    reuses the stored result. Cache failures fall through to a plain search.
+    """
+    key_emb = None
+    if len(texts) == 1 and collection_name in _SEMANTIC_CACHE_COLLECTIONS:
+        try:
+            key_emb = embed(list(texts))
+            cached = _semantic_cache_lookup(key_emb, n_results, collection_name)
+            if cached is not None:
+                return cached
+        except Exception:
+            key_emb = None
+
+    collection = get_collection(collection_name)
+    result = collection.query(query_texts=list(texts), n_results=n_results)
+
+    if key_emb is not None:
+        try:
+            _semantic_cache_store(key_emb, n_results, collection_name, result)
+        except Exception:
+            pass
+    return result
+
+
 def query(
     texts: List[str],
     n_results: int = 5,
@@ -145,8 +282,7 @@ def query(
         logger.warning("ChromaDB unavailable – returning empty query result.")
         return {}
 
-    collection = get_collection(collection_name)
-    return collection.query(query_texts=texts, n_results=n_results)
+    return _query_cached(tuple(texts), n_results, collection_name)
 
 
 # ---------------------------------------------------------------------------
@@ -1,8 +1,9 @@
 """Caching utilities for Streamlit app.
 
-Thin wrapper around :pyfunc:`src.quality_checks.load_data` providing
-`st.cache_data` memoisation so repeated uploads or dashboard reloads
-do not re-parse the CSV."""
+Thin wrapper around :pyfunc:`src.quality_checks.load_data`. The loaded
+frame lives in Streamlit's *resource* cache, so every session in the
+process shares one physical copy by reference instead of pickling its own
+– callers must treat the returned DataFrame as read-only."""
 
 from pathlib import Path
 import pandas as pd
@@ -11,15 +12,13 @@ import streamlit as st
 from src.quality_checks import load_data as _load_data
 
 
-@st.cache_data(show_spinner="Loading dataset...")
+@st.cache_resource(show_spinner="Loading dataset...")
 def load_data(path: str | Path | None = None) -> pd.DataFrame:
-    """Cached wrapper around :pyfunc:`src.quality_checks.load_data`."""
+    """Shared, process-wide wrapper around :pyfunc:`src.quality_checks.load_data`."""
     try:
         return _load_data(path)
-    except FileNotFoundError as exc:
+    except FileNotFoundError:
         st.warning(
             "Dataset not found – using empty DataFrame. Upload a CSV via sidebar or place data/raw/futures_dataset.csv."
         )
-        import pandas as pd
-
         return pd.DataFrame()
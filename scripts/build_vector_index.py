@@ -14,7 +14,6 @@ from __future__ import annotations
 import argparse
 import logging
 from pathlib import Path
-from typing import List
 
 import pandas as pd
 from tqdm import tqdm
@@ -25,14 +24,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def chunked(iterable: List, size: int):
-    """Yield successive `size`-sized chunks from *iterable*."""
-    for i in range(0, len(iterable), size):
-        yield iterable[i : i + size]
-
-
 def build_index(
-    csv_path: Path, collection_name: str = "futures_rag", batch_size: int = 100
+    csv_path: Path, collection_name: str = "futures_rag", batch_size: int = 200
 ):
     """Read *csv_path* and add its rows to the Chroma index.
 
@@ -45,46 +38,51 @@ def build_index(
     batch_size: int
         Number of rows to embed and add per request to avoid rate limits.
     """
-    logger.info("Loading CSV: %s", csv_path)
-    df = pd.read_csv(csv_path)
-
-    missing_cols = {c for c in ("AI_Explanation", "AI_Trend") if c not in df.columns}
-    if missing_cols:
-        raise ValueError(f"CSV missing expected columns: {', '.join(missing_cols)}")
-
-    docs = (df["AI_Explanation"].fillna("") + " " + df["AI_Trend"].fillna("")).tolist()
-    metadatas = df.to_dict("records")  # type: ignore[assignment]
-
-    # Create deterministic IDs: Date_Symbol or fallback to row index.
-    if {"Date", "Symbol"}.issubset(df.columns):
-        ids = (df["Date"].astype(str) + "_" + df["Symbol"].astype(str)).tolist()
-    else:
-        ids = [str(i) for i in range(len(df))]
-
     logger.info(
-        "Indexing %d documents into collection '%s' (batch %d)",
-        len(docs),
+        "Streaming CSV into collection '%s' (batch %d): %s",
         collection_name,
         batch_size,
+        csv_path,
+    )
+
+    # Stream the CSV one batch at a time instead of materializing the full
+    # frame plus a records-list for every row – peak memory stays at one
+    # batch regardless of dataset size.
+    reader = pd.read_csv(
+        csv_path, chunksize=batch_size, dtype={"Symbol": "category", "Date": "int32"}
     )
 
-    for doc_batch, meta_batch, id_batch in tqdm(
-        zip(
-            chunked(docs, batch_size),
-            chunked(metadatas, batch_size),
-            chunked(ids, batch_size),
-        )
-    ):
+    total = 0
+    for chunk_df in tqdm(reader, unit="batch"):
+        if total == 0:
+            missing_cols = {
+                c for c in ("AI_Explanation", "AI_Trend") if c not in chunk_df.columns
+            }
+            if missing_cols:
+                raise ValueError(
+                    f"CSV missing expected columns: {', '.join(missing_cols)}"
+                )
+
+        docs = (
+            chunk_df["AI_Explanation"].fillna("") + " " + chunk_df["AI_Trend"].fillna("")
+        ).tolist()
+        metadatas = chunk_df.to_dict("records")  # type: ignore[assignment]
+
+        # Create deterministic IDs: Date_Symbol or fallback to row index.
+        if {"Date", "Symbol"}.issubset(chunk_df.columns):
+            ids = (
+                chunk_df["Date"].astype(str) + "_" + chunk_df["Symbol"].astype(str)
+            ).tolist()
+        else:
+            ids = [str(i) for i in range(total, total + len(chunk_df))]
+
         try:
-            add_documents(
-                doc_batch, meta_batch, id_batch, collection_name=collection_name
-            )
+            add_documents(docs, metadatas, ids, collection_name=collection_name)
         except Exception as exc:
-            logger.error(
-                "Failed to add batch starting with id %s: %s", id_batch[0], exc
-            )
+            logger.error("Failed to add batch starting with id %s: %s", ids[0], exc)
+        total += len(chunk_df)
 
-    logger.info("Index build completed.")
+    logger.info("Index build completed (%d rows).", total)
 
 
 if __name__ == "__main__":
@@ -101,7 +99,7 @@ if __name__ == "__main__":
         "--collection", default="futures_rag", help="Chroma collection name"
     )
     parser.add_argument(
-        "--batch", type=int, default=100, help="Batch size for embedding requests"
+        "--batch", type=int, default=200, help="Batch size for embedding requests"
     )
     args = parser.parse_args()
 
@@ -15,37 +15,61 @@ ROOT = pathlib.Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+import numpy as np
 import pandas as pd
 from src import quality_checks as qc
 
+SEVERITY_ORDER = ("critical", "major", "minor")
 
-def compute_flags(df: pd.DataFrame) -> pd.DataFrame:
-    # Map of check name -> boolean mask
-    flag_cols: dict[str, pd.Series] = {}
 
-    for name, func in qc.CHECK_FUNCTIONS.items():
+def compute_flags(df: pd.DataFrame) -> pd.DataFrame:
+    # One uint8 flag matrix (rows × checks) instead of a dict of bool Series.
+    # The row-local price rules come from a single fused sweep over the
+    # OHLCV arrays; the remaining checks run individually.
+    names = list(qc.CHECK_FUNCTIONS)
+    flags = np.zeros((len(df), len(names)), dtype=np.uint8)
+    # The fused sweep needs the full OHLCV set; on partial frames fall back
+    # to the per-check paths below so one missing column cannot abort the
+    # whole run (each of those is individually guarded).
+    fused: dict[str, np.ndarray] = {}
+    if set(qc.REQUIRED_COLS["Stagnant price"]).issubset(df.columns):
+        fused = qc.fused_row_masks(df)
+    for j, name in enumerate(names):
+        if name in fused:
+            flags[:, j] = fused[name]
+            continue
+        # Mask-returning variants skip the filtered-frame + isin round-trip
+        mask_fn = qc.CHECK_MASK_FUNCTIONS.get(name)
+        if mask_fn is not None:
+            try:
+                flags[:, j] = mask_fn(df)
+            except Exception:
+                pass
+            continue
         try:
-            flagged_idx = func(df).index  # type: ignore
+            flagged_idx = qc.CHECK_FUNCTIONS[name](df).index  # type: ignore
         except Exception:
             flagged_idx = pd.Index([])
-        flag_cols[name] = df.index.isin(flagged_idx)
+        flags[:, j] = df.index.isin(flagged_idx)
 
-    flags_df = pd.DataFrame(flag_cols, index=df.index)
+    flags_df = pd.DataFrame(flags.astype(bool), columns=names, index=df.index)
 
-    # aggregate per severity
-    for sev in ["critical", "major", "minor"]:
-        checks_sev = [
-            n
-            for n, s in qc.DEFAULT_SEVERITIES.items()
-            if s == sev and n in flags_df.columns
-        ]
-        flags_df[f"{sev}_flags"] = flags_df[checks_sev].sum(axis=1).astype(int)
+    # All three severity counts fall out of a single
+    # (rows × checks) @ (checks × 3) matmul over the flag matrix.
+    sev_mask = np.zeros((len(names), 3), dtype=np.int32)
+    for j, name in enumerate(names):
+        sev = qc.DEFAULT_SEVERITIES.get(name)
+        if sev in SEVERITY_ORDER:
+            sev_mask[j, SEVERITY_ORDER.index(sev)] = 1
+    counts = flags.astype(np.int32) @ sev_mask
+    for k, sev in enumerate(SEVERITY_ORDER):
+        flags_df[f"{sev}_flags"] = counts[:, k]
 
     return pd.concat([df, flags_df], axis=1)
 
 
 def main(inp: Path, out: Path | None):
-    df = pd.read_csv(inp)
+    df = qc.read_csv_cached(inp)
     df["Date"] = df["Date"].astype(int)
 
     result = compute_flags(df)
@@ -22,40 +22,96 @@ ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+import hashlib
+import json
+
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
 from app.services import openai_service as oai
-
-ROW_PROMPT = Path("app/prompts/row_enrich.md").read_text()
-TREND_PROMPT = Path("app/prompts/trend_enrich.md").read_text()
-
-
-def build_context(df_sym: pd.DataFrame, idx: int, window: int = 7) -> pd.DataFrame:
-    """Return rows (as list[dict]) within *window* days up to current index (inclusive)."""
-    current_date = df_sym.iloc[idx]["Date"]
-    mask = (df_sym["Date"] >= current_date - window) & (df_sym["Date"] <= current_date)
-    return df_sym.loc[mask]
+from app.services import vector_db as vdb
+from src import quality_checks as qc
+
+# Single merged template: one JSON completion yields both the explanation
+# and the trend sentence, halving round-trips per row.
+MERGED_PROMPT = Path("app/prompts/row_trend_enrich.md").read_text()
+
+# Semantic cache: neighbouring rows within a symbol share near-identical
+# 7-day context windows, so prompts are highly repetitive. Completions are
+# stored in a dedicated Chroma collection and reused whenever a new prompt
+# is within the cosine-similarity threshold of a cached one.
+CACHE_COLLECTION = "enrich_cache"
+CACHE_SIMILARITY_THRESHOLD = 0.86
+
+
+def cached_complete(
+    prompt: str, model: str, response_format: dict | None = None
+) -> str:
+    """``oai.complete`` behind a semantic cache (best-effort).
+
+    A near-duplicate prompt (cosine similarity ≥ threshold) returns the
+    stored completion without an LLM call. Cache failures – e.g. Chroma
+    unavailable – silently fall through to the plain completion.
+    """
+    try:
+        hit = vdb.query([prompt], n_results=1, collection_name=CACHE_COLLECTION)
+        metas = hit.get("metadatas", [[]])[0]
+        dists = hit.get("distances", [[]])[0]
+        if metas and dists and 1 - float(dists[0]) >= CACHE_SIMILARITY_THRESHOLD:
+            return metas[0]["completion"]
+    except Exception:
+        pass
+
+    text = oai.complete(prompt, model=model, response_format=response_format)
+    try:
+        vdb.add_documents(
+            [prompt],
+            [{"completion": text}],
+            ids=[hashlib.sha256(prompt.encode()).hexdigest()],
+            collection_name=CACHE_COLLECTION,
+        )
+    except Exception:
+        pass
+    return text
+
+
+def build_context(
+    df_sym: pd.DataFrame, dates: np.ndarray, idx: int, window: int = 7
+) -> pd.DataFrame:
+    """Return rows within *window* days up to the current row's date (inclusive).
+
+    *df_sym* must be date-sorted and *dates* its ``Date`` column as ndarray:
+    the window is then two binary searches and a positional slice instead of
+    an O(N) boolean scan per row.
+    """
+    lo = np.searchsorted(dates, dates[idx] - window, side="left")
+    hi = np.searchsorted(dates, dates[idx], side="right")
+    return df_sym.iloc[lo:hi]
 
 
 def explain_row(row: pd.Series, context_rows: pd.DataFrame) -> tuple[str, str]:
     ctx_records = context_rows.to_dict(orient="records")
     row_dict = row.to_dict()
-    prompt_explain = (
-        ROW_PROMPT.replace("{{row}}", str(row_dict))
+    prompt = (
+        MERGED_PROMPT.replace("{{row}}", str(row_dict))
         .replace("{{checks}}", "auto")
         .replace("{{context}}", str(ctx_records))
     )
 
-    prompt_trend = TREND_PROMPT.replace("{{context}}", str(ctx_records))
-
-    explanation = oai.complete(prompt_explain, model="gpt-3.5-turbo")
-    trend = oai.complete(prompt_trend, model="gpt-3.5-turbo")
-    return explanation, trend
+    raw = cached_complete(
+        prompt, model="gpt-3.5-turbo", response_format={"type": "json_object"}
+    )
+    try:
+        payload = json.loads(raw)
+        return str(payload.get("explanation", "")), str(payload.get("trend", ""))
+    except (json.JSONDecodeError, TypeError):
+        # Model ignored the JSON instruction – keep the text as explanation
+        return raw, ""
 
 
 def main(input_path: Path, out_path: Path, batch_size: int = 100):
-    df = pd.read_csv(input_path)
+    df = qc.read_csv_cached(input_path)
     df["Date"] = df["Date"].astype(int)
     explanations: list[str] = []
     trends: list[str] = []
@@ -69,8 +125,9 @@ def main(input_path: Path, out_path: Path, batch_size: int = 100):
     processed = 0
     for symbol, grp in df.groupby("Symbol"):
         grp_sorted = grp.sort_values("Date").reset_index()
+        dates = grp_sorted["Date"].to_numpy()
         for idx, row in grp_sorted.iterrows():
-            ctx = build_context(grp_sorted, idx)
+            ctx = build_context(grp_sorted, dates, idx)
             expl, tr = explain_row(row, ctx)
             buffer_expl.append(expl)
             buffer_trend.append(tr)
@@ -1,7 +1,17 @@
 """Nascent Daily Futures Data-Quality prototype package."""
 
-import importlib, sys
+import importlib
 
-sys.modules.setdefault(
-    __name__ + ".quality_checks", importlib.import_module(__name__ + ".quality_checks")
-)
+# PEP 562 lazy submodule access: `from src import quality_checks` resolves on
+# first attribute lookup instead of importing the (pandas-heavy) module as a
+# side effect of importing the package.
+
+
+def __getattr__(name):
+    if name == "quality_checks":
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | {"quality_checks"})
@@ -17,9 +17,11 @@ are unit-testable and re-usable in batch jobs.
 
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
 # ---------------------------------------------------------------------------
@@ -30,6 +32,93 @@ DEFAULT_LOCATIONS = [
     Path("app/data/raw/futures_dataset.csv"),
 ]
 
+CACHE_DIR = Path(".cache")
+
+#: Narrow load-time dtypes – prices as float32 (exact for the magnitudes in
+#: EOD futures data), counters as int32. Halves the memory every check scans.
+_LOAD_DTYPES: Dict[str, str] = {
+    "Date": "int32",
+    "Open": "float32",
+    "High": "float32",
+    "Low": "float32",
+    "Close": "float32",
+    "Volume": "int32",
+    "Open Interest": "int32",
+}
+
+
+def _parse_csv(path: Path) -> pd.DataFrame:
+    """CSV parse with narrow dtypes applied by the parser itself.
+
+    Casting during the parse avoids materialising 64-bit intermediates only
+    to down-cast them afterwards. Unknown columns keep their inferred dtype;
+    if a column cannot take its narrow dtype (e.g. NaNs in an int column),
+    fall back to default inference and let ``_prepare`` cast what it can.
+    """
+    dtypes = {**_LOAD_DTYPES, "Symbol": "category"}
+    try:
+        return pd.read_csv(path, dtype=dtypes)
+    except (ValueError, TypeError):
+        return pd.read_csv(path)
+
+
+def _read_csv_cached(path: Path) -> pd.DataFrame:
+    """Read *path*, transparently caching a Parquet copy under ``.cache/``.
+
+    The first read parses the CSV and writes ``<sha1(path)>.parquet``; later
+    reads come from the columnar copy (several times faster to load than
+    re-parsing text) as long as it is newer than the CSV. Falls back to a
+    plain CSV read when pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return _parse_csv(path)
+
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{digest}.parquet"
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        return pd.read_parquet(cache_path)
+
+    df = _parse_csv(path)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        df.to_parquet(cache_path, compression="zstd")
+    except Exception:  # cache write is best-effort – keep serving the parse
+        pass
+    return df
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Post-load normalisation applied to every dataset returned by ``load_data``."""
+    if "Symbol" in df.columns:
+        # Categorical symbols: every downstream groupby("Symbol") then works
+        # on small integer codes instead of re-hashing string objects.
+        df["Symbol"] = df["Symbol"].astype("category")
+    # Cast column-by-column: a dirty column (e.g. a NaN in an int field –
+    # exactly what a data-quality run must tolerate) keeps its inferred
+    # dtype instead of aborting the whole load.
+    for col, dtype in _LOAD_DTYPES.items():
+        if col not in df.columns:
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (ValueError, TypeError):
+            pass
+    # One deliberate copy after the casts consolidates the block manager so
+    # the check scans run over a handful of contiguous blocks.
+    return df.copy()
+
+
+def read_csv_cached(path: str | Path) -> pd.DataFrame:
+    """Public wrapper around the Parquet-backed CSV reader (no normalisation).
+
+    Scripts that take arbitrary CSV paths use this to share the ``.cache/``
+    columnar copies without the categorical/dtype post-processing that
+    ``load_data`` applies.
+    """
+    return _read_csv_cached(Path(path))
+
 
 def load_data(csv_path: str | Path | None = None) -> pd.DataFrame:
     """Load dataset from *csv_path* or the default raw data location.
@@ -52,12 +141,12 @@ def load_data(csv_path: str | Path | None = None) -> pd.DataFrame:
     """
     if csv_path:
         path = Path(csv_path)
-        return pd.read_csv(path)
+        return _prepare(_read_csv_cached(path))
 
     # Try default locations in order
     for candidate in DEFAULT_LOCATIONS:
         if candidate.exists():
-            return pd.read_csv(candidate)
+            return _prepare(_read_csv_cached(candidate))
 
     raise FileNotFoundError("futures_dataset.csv not found in default locations.")
 
@@ -78,53 +167,85 @@ def symbol_coverage(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
+def duplicated_rows_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of duplicated (Date, Symbol) rows."""
+    return df.duplicated(subset=["Date", "Symbol"], keep=False).to_numpy()
+
+
 def duplicated_rows(df: pd.DataFrame) -> pd.DataFrame:
     """Return duplicated (Date, Symbol) rows."""
-    mask = df.duplicated(subset=["Date", "Symbol"], keep=False)
-    return df.loc[mask].copy()
+    return df.loc[duplicated_rows_mask(df)]
 
 
 # === OHLC integrity ===
 
 
-def ohlc_integrity_violations(df: pd.DataFrame) -> pd.DataFrame:
-    """Flag rows where OHLC logical relationships are violated."""
-    violations = df[
+def ohlc_integrity_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows where OHLC logical relationships are violated."""
+    return (
         (df["Low"] > df["High"])
         | (df["Close"] > df["High"])
         | (df["Close"] < df["Low"])
         | (df["Open"] > df["High"])
         | (df["Open"] < df["Low"])
-    ].copy()
-    return violations
+    ).to_numpy()
+
+
+def ohlc_integrity_violations(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag rows where OHLC logical relationships are violated."""
+    return df.loc[ohlc_integrity_mask(df)]
 
 
 # === Flatlines ===
 
 
-def flatline_rows(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Return two DataFrames: (volume == 0, volume > 0) where OHLC are identical."""
-    flat_mask = (
+#: Single-entry memo of the flatline mask – stagnant_price and
+#: flat_price_anomaly both need it, so one flag pass computes it once.
+_FLAT_CACHE: dict[int, Tuple[int, pd.Series]] = {}
+
+
+def _flatline_mask(df: pd.DataFrame) -> pd.Series:
+    """Boolean Series where all four OHLC fields are identical (memoized)."""
+    hit = _FLAT_CACHE.get(id(df))
+    if hit is not None and hit[0] == len(df):
+        return hit[1]
+    mask = (
         (df["Open"] == df["High"])
         & (df["Open"] == df["Low"])
         & (df["Open"] == df["Close"])
     )
-    flat = df[flat_mask].copy()
+    _FLAT_CACHE.clear()  # keep at most one dataset alive
+    _FLAT_CACHE[id(df)] = (len(df), mask)
+    return mask
+
+
+def flatline_rows(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return two DataFrames: (volume == 0, volume > 0) where OHLC are identical."""
+    flat = df[_flatline_mask(df)]
     return flat[flat["Volume"] == 0], flat[flat["Volume"] > 0]
 
 
 # --- New flat price helpers ---
 
 
+def stagnant_price_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of flat price rows where Volume == 0."""
+    return (_flatline_mask(df) & (df["Volume"] == 0)).to_numpy()
+
+
 def stagnant_price(df: pd.DataFrame) -> pd.DataFrame:
     """Flat price rows where Volume == 0 (likely non-trading day)."""
-    return flatline_rows(df)[0]
+    return df.loc[stagnant_price_mask(df)]
+
+
+def flat_price_anomaly_mask(df: pd.DataFrame, min_volume: int = 1) -> np.ndarray:
+    """Boolean mask of flat price rows where Volume ≥ *min_volume*."""
+    return (_flatline_mask(df) & (df["Volume"] >= max(min_volume, 1))).to_numpy()
 
 
 def flat_price_anomaly(df: pd.DataFrame, min_volume: int = 1) -> pd.DataFrame:
     """Flat price rows where Volume ≥ *min_volume* (suspicious)."""
-    vol_rows = flatline_rows(df)[1]
-    return vol_rows[vol_rows["Volume"] >= min_volume]
+    return df.loc[flat_price_anomaly_mask(df, min_volume)]
 
 
 # === Missing dates ===
@@ -134,105 +255,256 @@ def missing_dates(df: pd.DataFrame) -> pd.DataFrame:
     """Return rows representing (Symbol, Date) combinations that are missing.
 
     Output columns: ``Symbol`` and ``MissingDate`` (ISO date).
+
+    Computed as one MultiIndex set difference – Cartesian (Symbol × calendar)
+    minus the observed pairs – which runs in C instead of building a Python
+    set of Timestamps per symbol.
     """
-    symbols = df["Symbol"].unique()
     full_dates = pd.date_range(df["Date"].min(), df["Date"].max(), freq="D")
+    full = pd.MultiIndex.from_product(
+        [df["Symbol"].unique(), full_dates], names=["Symbol", "MissingDate"]
+    )
+    present = pd.MultiIndex.from_arrays(
+        [df["Symbol"], pd.to_datetime(df["Date"])], names=["Symbol", "MissingDate"]
+    )
+    missing = full.difference(present).to_frame(index=False)
+    missing["MissingDate"] = missing["MissingDate"].dt.date
+    return missing
 
-    records = []
-    for sym in symbols:
-        dates_present = pd.to_datetime(df[df["Symbol"] == sym]["Date"].unique())
-        missing = set(full_dates) - set(dates_present)
-        for d in missing:
-            records.append({"Symbol": sym, "MissingDate": d.date()})
 
-    return pd.DataFrame(records)
+# === High < Low inversion ===
 
 
-# === High < Low inversion ===
+def high_low_inversion_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows where High < Low."""
+    return (df["High"] < df["Low"]).to_numpy()
 
 
 def high_low_inversion(df: pd.DataFrame) -> pd.DataFrame:
     """Rows where High < Low (explicit inversion check)."""
-    return df[df["High"] < df["Low"]].copy()
+    return df.loc[high_low_inversion_mask(df)]
 
 
 # === Negative numeric ===
 
 
+def negative_numeric_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows where any numeric field is negative.
+
+    The comparison runs on one ndarray instead of allocating a boolean
+    DataFrame across the numeric columns.
+    """
+    numeric_cols = df.select_dtypes("number").columns
+    if not len(numeric_cols):
+        return np.zeros(len(df), dtype=bool)
+    arr = df[numeric_cols].to_numpy(copy=False)
+    return np.any(arr < 0, axis=1)
+
+
 def negative_numeric(df: pd.DataFrame) -> pd.DataFrame:
     """Rows where any numeric field is negative."""
-    numeric_cols = df.select_dtypes("number").columns
-    mask = (df[numeric_cols] < 0).any(axis=1)
-    return df[mask].copy()
+    return df.loc[negative_numeric_mask(df)]
 
 
 # === Outliers ===
 
+#: Single-entry memo of the last (Symbol, Date)-sorted frame. Several checks
+#: need the same sort; keying on identity + length means repeated calls on one
+#: loaded dataset pay for the sort exactly once.
+_SORTED_CACHE: dict[int, Tuple[int, pd.DataFrame]] = {}
+
+
+def _sorted_by_symbol_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Return *df* sorted by (Symbol, Date), memoized per input frame.
+
+    The returned frame is shared between callers and must not be mutated;
+    derive new columns as standalone Series instead.
+    """
+    hit = _SORTED_CACHE.get(id(df))
+    if hit is not None and hit[0] == len(df):
+        return hit[1]
+    df_sorted = df.sort_values(["Symbol", "Date"])
+    _SORTED_CACHE.clear()  # keep at most one dataset alive
+    _SORTED_CACHE[id(df)] = (len(df), df_sorted)
+    return df_sorted
+
+
+#: Single-entry memo of the Symbol grouper over the shared sorted frame.
+#: Building a groupby is not free (key factorization + group indices); the
+#: checks that group on Symbol share one grouper per loaded dataset.
+_GROUPER_CACHE: dict[int, Tuple[int, object]] = {}
+
+
+def _symbol_grouper(df: pd.DataFrame):
+    """Symbol-keyed DataFrameGroupBy over the sorted frame, memoized per input.
+
+    Group indices are computed lazily inside pandas and cached on the
+    grouper, so every check reusing this object skips the factorization.
+    """
+    hit = _GROUPER_CACHE.get(id(df))
+    if hit is not None and hit[0] == len(df):
+        return hit[1]
+    gb = _sorted_by_symbol_date(df).groupby("Symbol", sort=False, observed=True)
+    _GROUPER_CACHE.clear()  # keep at most one dataset alive
+    _GROUPER_CACHE[id(df)] = (len(df), gb)
+    return gb
+
 
 def pct_change_outliers(df: pd.DataFrame, threshold: float = 0.5) -> pd.DataFrame:
-    """Flag rows where absolute day-over-day close change exceeds *threshold* (50 % default)."""
-    df_sorted = df.sort_values(["Symbol", "Date"]).copy()
-    df_sorted["close_pct_change"] = df_sorted.groupby("Symbol")["Close"].pct_change()
-    mask = df_sorted["close_pct_change"].abs() > threshold
-    return df_sorted.loc[mask]
+    """Flag rows where absolute day-over-day close change exceeds *threshold* (50 % default).
+
+    On the shared (Symbol, Date)-sorted frame the per-symbol pct-change is
+    one shifted NumPy division: the previous close is ``close[:-1]`` and
+    symbol boundaries (where the shifted row belongs to another symbol)
+    are masked to NaN, exactly like groupby().pct_change().
+    """
+    df_sorted = _sorted_by_symbol_date(df)
+    # Materialize as float so the NaN sentinel below works even when Close
+    # arrives as an int column (frames not routed through _prepare).
+    close = df_sorted["Close"].to_numpy(dtype=np.float64)
+    sym_col = df_sorted["Symbol"]
+    if isinstance(sym_col.dtype, pd.CategoricalDtype):
+        # Compare integer category codes – one vectorized int comparison
+        # instead of per-element string equality.
+        sym = sym_col.cat.codes.to_numpy()
+    else:
+        sym = sym_col.to_numpy()
+
+    prev = np.empty_like(close)
+    same_sym = np.zeros(len(close), dtype=bool)
+    if len(close):
+        prev[0] = np.nan
+        prev[1:] = close[:-1]
+        same_sym[1:] = sym[1:] == sym[:-1]
+
+    # Division-free threshold test: |close/prev − 1| > thr  ⇔
+    # |close − prev| > thr·|prev|, plus a zero prev with a non-zero close
+    # (an infinite pct-change, always flagged). One multiply per row instead
+    # of one divide; actual pct values are only computed for the flagged few.
+    zero_prev = prev == 0
+    exceeds = np.abs(close - prev) > threshold * np.abs(prev)
+    flagged = np.flatnonzero(
+        same_sym & ((~zero_prev & exceeds) | (zero_prev & (close != 0)))
+    )
+    with np.errstate(divide="ignore"):
+        pct_flagged = close[flagged] / prev[flagged] - 1.0
+    return df_sorted.iloc[flagged].assign(close_pct_change=pct_flagged)
+
+
+def iqr_price_outliers_mask(df: pd.DataFrame, multiplier: float = 3.0) -> np.ndarray:
+    """Boolean mask of per-symbol IQR price outliers.
+
+    Both quantiles come out of one groupby pass (the two former transform
+    calls each re-ran the grouping); per-symbol bounds are then broadcast
+    row-aligned via reindex. No per-symbol Python loop, no concat.
+    """
+    q = _symbol_grouper(df)["Close"].quantile([0.25, 0.75]).unstack()
+    iqr = q[0.75] - q[0.25]
+    lower = (q[0.25] - multiplier * iqr).reindex(np.asarray(df["Symbol"])).to_numpy()
+    upper = (q[0.75] + multiplier * iqr).reindex(np.asarray(df["Symbol"])).to_numpy()
+    close = df["Close"].to_numpy()
+    return (close < lower) | (close > upper)
 
 
 def iqr_price_outliers(df: pd.DataFrame, multiplier: float = 3.0) -> pd.DataFrame:
     """Flag absolute price outliers per symbol via IQR method."""
-    outlier_rows = []
-    for symbol, grp in df.groupby("Symbol"):
-        q1 = grp["Close"].quantile(0.25)
-        q3 = grp["Close"].quantile(0.75)
-        iqr = q3 - q1
-        lower = q1 - multiplier * iqr
-        upper = q3 + multiplier * iqr
-        outlier_rows.append(grp[(grp["Close"] < lower) | (grp["Close"] > upper)])
-    return pd.concat(outlier_rows) if outlier_rows else pd.DataFrame(columns=df.columns)
+    return df.loc[iqr_price_outliers_mask(df, multiplier)]
 
 
 # === Volume anomalies ===
 
 
+#: Single-entry memo of the last volume_anomalies result. The registry exposes
+#: the zero-volume and extreme-volume rules as separate checks, each backed by
+#: the same computation – memoizing the pair means a full run pays for it once.
+_VOLUME_CACHE: dict[Tuple[int, float], Tuple[int, Tuple[pd.DataFrame, pd.DataFrame]]] = {}
+
+
 def volume_anomalies(
     df: pd.DataFrame, factor: float = 10.0
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Return (zero_volume_price_moved, extreme_volume_rows)."""
-    df_sorted = df.sort_values(["Symbol", "Date"]).copy()
-    df_sorted["close_diff"] = df_sorted.groupby("Symbol")["Close"].diff().abs()
-
-    zero_vol_price_move = df_sorted[
-        (df_sorted["Volume"] == 0) & (df_sorted["close_diff"] > 0)
-    ]
-
-    extreme_volume_rows = []
-    for symbol, grp in df.groupby("Symbol"):
-        # Use median of *non-zero* volumes to avoid threshold always zero when volumes are sparse
-        median_vol = grp.loc[grp["Volume"] > 0, "Volume"].median()
-        # Fallback to 0 if all volumes are zero for that symbol
-        if pd.isna(median_vol) or median_vol == 0:
-            continue
-        threshold = median_vol * factor
-        extreme_volume_rows.append(grp[grp["Volume"] > threshold])
-    extreme_volume_rows_df = (
-        pd.concat(extreme_volume_rows)
-        if extreme_volume_rows
-        else pd.DataFrame(columns=df.columns)
+    """Return (zero_volume_price_moved, extreme_volume_rows), memoized per frame."""
+    hit = _VOLUME_CACHE.get((id(df), factor))
+    if hit is not None and hit[0] == len(df):
+        return hit[1]
+    df_sorted = _sorted_by_symbol_date(df)
+    close_diff = _symbol_grouper(df)["Close"].diff().abs()
+
+    zero_mask = (df_sorted["Volume"] == 0) & (close_diff > 0)
+    zero_vol_price_move = df_sorted.loc[zero_mask].assign(
+        close_diff=close_diff.loc[zero_mask]
+    )
+
+    # Median of *non-zero* volumes per symbol, computed on the already-sorted
+    # frame (grouping sorted keys is cheap) and broadcast back to the original
+    # row order via reindex instead of a second full-length transform on the
+    # unsorted frame. Zeros are masked to NaN so they neither enter the median
+    # nor flag themselves; an all-zero symbol yields a NaN threshold (compares
+    # False).
+    median_vol = (
+        df_sorted["Volume"]
+        .where(df_sorted["Volume"] > 0)
+        .groupby(df_sorted["Symbol"], sort=False, observed=True)
+        .median()
     )
+    thresholds = median_vol.reindex(np.asarray(df["Symbol"])).to_numpy()
+    extreme_volume_rows_df = df.loc[df["Volume"].to_numpy() > thresholds * factor]
+
+    result = (zero_vol_price_move, extreme_volume_rows_df)
+    _VOLUME_CACHE.clear()  # keep at most one dataset alive
+    _VOLUME_CACHE[(id(df), factor)] = (len(df), result)
+    return result
+
 
-    return zero_vol_price_move, extreme_volume_rows_df
+# === Fused row-local sweep ===
+
+
+def to_soa(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Structure-of-arrays view of the dataset columns (zero-copy where possible).
+
+    Returns the known dataset columns as plain ndarrays in their stored
+    dtypes (int32/float32 after the load-path casts). Hot kernels can grab
+    this once instead of paying the per-column accessor overhead repeatedly.
+    """
+    return {
+        col: df[col].to_numpy(copy=False)
+        for col in EXPECTED_COLUMNS
+        if col in df.columns
+    }
+
+
+def fused_row_masks(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """All purely row-local OHLCV masks from one pass over the columns.
+
+    Batch flag jobs run several checks that each re-read the same price
+    arrays; this reads Open/High/Low/Close/Volume exactly once via
+    ``to_soa`` and derives the four row-local rules from shared
+    intermediates. Keys match ``CHECK_FUNCTIONS`` names.
+    """
+    soa = to_soa(df)
+    o, h, low = soa["Open"], soa["High"], soa["Low"]
+    c, v = soa["Close"], soa["Volume"]
+
+    flat = (o == h) & (o == low) & (o == c)
+    return {
+        "OHLC range violation": (low > h) | (c > h) | (c < low) | (o > h) | (o < low),
+        "High < Low inversion": h < low,
+        "Stagnant price": flat & (v == 0),
+        "Flat price anomaly": flat & (v >= 1),
+    }
 
 
 # === Schema check ===
 
 EXPECTED_COLUMNS: Dict[str, str] = {
-    "Date": "int64",
+    "Date": "int32",
     "Symbol": "object",
-    "Open": "int64",
-    "High": "int64",
-    "Low": "int64",
-    "Close": "int64",
-    "Volume": "int64",
-    "Open Interest": "int64",
+    "Open": "float32",
+    "High": "float32",
+    "Low": "float32",
+    "Close": "float32",
+    "Volume": "int32",
+    "Open Interest": "int32",
 }
 
 
@@ -241,9 +513,13 @@ def check_schema(df: pd.DataFrame) -> pd.DataFrame:
 
     Output columns: ``field, expected_dtype, found_dtype, note``
     """
+    # One dtypes snapshot instead of a per-column ``df[col].dtype`` lookup
+    # (each of those materialises a column accessor).
+    found_map = df.dtypes.to_dict()
     issues = []
     for col, dtype in EXPECTED_COLUMNS.items():
-        if col not in df.columns:
+        found_dtype = found_map.get(col)
+        if found_dtype is None:
             issues.append(
                 {
                     "field": col,
@@ -252,31 +528,52 @@ def check_schema(df: pd.DataFrame) -> pd.DataFrame:
                     "note": "column missing",
                 }
             )
+            continue
+        if isinstance(found_dtype, pd.CategoricalDtype):
+            # Symbols are categoricalized at load – compare against the
+            # underlying category dtype, not "category" itself.
+            found = str(found_dtype.categories.dtype)
         else:
-            found = str(df[col].dtype)
-            if found != dtype:
-                issues.append(
-                    {
-                        "field": col,
-                        "expected": dtype,
-                        "found": found,
-                        "note": "dtype mismatch",
-                    }
-                )
+            found = str(found_dtype)
+        if found != dtype:
+            issues.append(
+                {
+                    "field": col,
+                    "expected": dtype,
+                    "found": found,
+                    "note": "dtype mismatch",
+                }
+            )
+    if not issues:
+        return pd.DataFrame(
+            columns=["field", "expected", "found", "note"]
+        )
     return pd.DataFrame(issues)
 
 
 # === Open interest check ===
 
 
+def check_oi_mask(df: pd.DataFrame, spike_factor: float = 10.0) -> np.ndarray:
+    """Boolean mask of rows with negative or spiking Open Interest."""
+    if "Open Interest" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    # Work on the raw ndarray: one median pass plus two fused comparisons,
+    # without materialising intermediate boolean Series.
+    oi = df["Open Interest"].to_numpy(copy=False)
+    if oi.size == 0:
+        return np.zeros(0, dtype=bool)
+    # nanmedian keeps the Series.median skipna semantics: one NaN OI cell
+    # must not disable spike detection for the whole frame.
+    threshold = np.nanmedian(oi) * spike_factor
+    return (oi < 0) | (oi > threshold)
+
+
 def check_oi(df: pd.DataFrame, spike_factor: float = 10.0) -> pd.DataFrame:
     """Flag rows where Open Interest is negative or extreme spike (>factor×median)."""
     if "Open Interest" not in df.columns:
         return pd.DataFrame()
-    oi_series = df["Open Interest"]
-    median = oi_series.median() if not oi_series.empty else 0
-    mask = (oi_series < 0) | (oi_series > median * spike_factor)
-    return df[mask].copy()
+    return df.loc[check_oi_mask(df, spike_factor)]
 
 
 # ---------------------------------------------------------------------------
@@ -331,12 +628,48 @@ CHECK_FUNCTIONS: Dict[str, callable] = {
     "Open interest": check_oi,
 }
 
+#: Columns each check needs to produce a meaningful result. Runners consult
+#: this to short-circuit checks on frames missing the columns (e.g. partial
+#: uploads) instead of letting them raise KeyError mid-suite. Checks with an
+#: empty tuple degrade gracefully on their own (Schema reports the gap,
+#: Negative numeric / Open interest guard internally).
+REQUIRED_COLS: Dict[str, Tuple[str, ...]] = {
+    "Duplicate row": ("Date", "Symbol"),
+    "Missing date": ("Date", "Symbol"),
+    "OHLC range violation": ("Open", "High", "Low", "Close"),
+    "Stagnant price": ("Open", "High", "Low", "Close", "Volume"),
+    "Flat price anomaly": ("Open", "High", "Low", "Close", "Volume"),
+    "Zero-volume with move": ("Date", "Symbol", "Close", "Volume"),
+    "Extreme volume outlier": ("Date", "Symbol", "Close", "Volume"),
+    "Day-over-day jump": ("Date", "Symbol", "Close"),
+    "Absolute price bounds (IQR)": ("Symbol", "Close"),
+    "High < Low inversion": ("High", "Low"),
+    "Negative numeric": (),
+    "Schema": (),
+    "Open interest": (),
+}
+
+#: Row-local rules that can hand back a boolean ndarray directly, skipping the
+#: filtered-frame materialisation and the mask reconstruction in callers.
+#: Order-changing (sorted) and report-style rules are absent on purpose.
+CHECK_MASK_FUNCTIONS: Dict[str, callable] = {
+    "Duplicate row": duplicated_rows_mask,
+    "OHLC range violation": ohlc_integrity_mask,
+    "Stagnant price": stagnant_price_mask,
+    "Flat price anomaly": flat_price_anomaly_mask,
+    "Absolute price bounds (IQR)": iqr_price_outliers_mask,
+    "High < Low inversion": high_low_inversion_mask,
+    "Negative numeric": negative_numeric_mask,
+    "Open interest": check_oi_mask,
+}
+
 # ---------------------------------------------------------------------------
 # Public export list (helps static analysers & ``from … import *`` hygiene)
 # ---------------------------------------------------------------------------
 
 __all__ = [
     "load_data",
+    "read_csv_cached",
     # helper / core rules
     "symbol_coverage",
     "duplicated_rows",
@@ -351,8 +684,21 @@ __all__ = [
     "volume_anomalies",
     "check_schema",
     "check_oi",
+    # mask-returning variants
+    "duplicated_rows_mask",
+    "ohlc_integrity_mask",
+    "stagnant_price_mask",
+    "flat_price_anomaly_mask",
+    "iqr_price_outliers_mask",
+    "high_low_inversion_mask",
+    "negative_numeric_mask",
+    "check_oi_mask",
+    "to_soa",
+    "fused_row_masks",
     # registries
     "DESCRIPTIONS",
     "DEFAULT_SEVERITIES",
+    "REQUIRED_COLS",
     "CHECK_FUNCTIONS",
+    "CHECK_MASK_FUNCTIONS",
 ]
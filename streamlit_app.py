@@ -6,7 +6,22 @@ picks up the correct page.
 
 import warnings
 
-warnings.filterwarnings("ignore", category=RuntimeWarning)
+import streamlit as st
 
-# Launch the actual dashboard
-from app import main as _main  # noqa: F401
+
+@st.cache_resource(show_spinner=False)
+def _load_dashboard():
+    """Import the dashboard module once per server process.
+
+    The RuntimeWarning suppression (Chroma's sqlite fallback warning) is
+    scoped to this import instead of a process-global filter, so warnings
+    from the rest of the app still surface.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        from app import main
+
+    return main
+
+
+_load_dashboard()